@@ -83,12 +83,27 @@ class Event:
 
     """
 
+    __slots__ = ('timestamp', 'event_type', 'source', 'destination')
+
     def __init__(self, timestamp, event_type):
         self.timestamp = timestamp
         self.event_type = event_type
         self.source = None
         self.destination = None
 
+    def __getstate__(self):
+        # Pickle slot values as a plain dict, the same shape used by
+        # traces pickled before events declared __slots__
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __repr__(self, *args, **kwargs):
         return '[%s] %s' % (self.timestamp, self.event_type.value)
 
@@ -102,6 +117,9 @@ class AppLaunchEvent(Event):
     Attributes:
         app_id (str): Unique id representing launched application
     """
+
+    __slots__ = ('app_id',)
+
     def __init__(self, timestamp, app_id):
         Event.__init__(self, event_type=EventType.APP_LAUNCH, timestamp=timestamp)
         self.app_id = app_id
@@ -134,6 +152,8 @@ class AppActivityUsageEvent(Event):
         MOVE_BACKGROUND = 0
         MOVE_FOREGROUND = 1
 
+    __slots__ = ('app_id', 'source_class', 'usage_event')
+
     def __init__(self, timestamp, app_id, source_class, usage_event):
         Event.__init__(self, event_type=EventType.APP_ACTIVITY_USAGE, timestamp=timestamp)
         self.app_id = app_id
@@ -159,6 +179,8 @@ class ScreenEvent(Event):
         state (:obj:'ScreenState'): New state of the screen
     """
 
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.SCREEN, timestamp=timestamp)
         self.state = state
@@ -177,6 +199,8 @@ class ScreenOrientationEvent(Event):
         state (:obj:'ScreenState'): New orientation of the screen
     """
 
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.SCREEN_ORIENTATION, timestamp=timestamp)
         self.state = state
@@ -194,6 +218,9 @@ class PhoneEvent(Event):
     Attributes:
         state (:obj:'PhoneState'): New state of phone call
     """
+
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.PHONE, timestamp=timestamp)
         self.state = state
@@ -222,6 +249,8 @@ class PackageEvent(Event):
         UPDATED = 2
         REPLACED = 3
 
+    __slots__ = ('management_event', 'app_id')
+
     def __init__(self, timestamp, package_event, package=None):
         Event.__init__(self, event_type=EventType.PACKAGE, timestamp=timestamp)
         self.management_event = package_event
@@ -253,6 +282,8 @@ class NotificationEvent(Event):
         POSTED = 1
         REMOVED = 0
 
+    __slots__ = ('action', 'app_id', 'notification_id', 'tag')
+
     def __init__(self, timestamp, action, app_id, notification_id, tag):
         Event.__init__(self, event_type=EventType.NOTIFICATION, timestamp=timestamp)
         self.action = action
@@ -266,6 +297,8 @@ class NotificationEvent(Event):
 
 
 class NetworkEvent(Event):
+    __slots__ = ()
+
     def __init__(self, timestamp):
         Event.__init__(self, event_type=EventType.NETWORK, timestamp=timestamp)
 
@@ -279,6 +312,9 @@ class NetworkStatusEvent(Event):
     Attributes:
         state (:obj:'NetworkConnectionState'):  Network connection state
     """
+
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.NETWORK_STATUS, timestamp=timestamp)
         self.state = state
@@ -297,6 +333,9 @@ class NetworkTypeEvent(Event):
     Attributes:
         network_type (:obj:'NetworkType'): A type of network
     """
+
+    __slots__ = ('network_type',)
+
     def __init__(self, timestamp, network_type):
         Event.__init__(self, event_type=EventType.NETWORK_TYPE, timestamp=timestamp)
         self.network_type = network_type
@@ -307,6 +346,8 @@ class NetworkTypeEvent(Event):
 
 
 class BatteryEvent(Event):
+    __slots__ = ()
+
     def __init__(self, timestamp):
         Event.__init__(self, event_type=EventType.BATTERY, timestamp=timestamp)
 
@@ -320,6 +361,9 @@ class BatteryEnergyEvent(Event):
     Attributes:
         state (:obj:'BatteryEnergyState'): State of battery energy level
     """
+
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.BATTERY_ENERGY_STATE, timestamp=timestamp)
         self.state = state
@@ -338,6 +382,9 @@ class BatteryStatusEvent(Event):
     Attributes:
         status (:obj:'BatteryStatus'): Battery status
     """
+
+    __slots__ = ('status',)
+
     def __init__(self, timestamp, status):
         Event.__init__(self, event_type=EventType.BATTERY_STATUS, timestamp=timestamp)
         self.status = status
@@ -356,6 +403,9 @@ class BatteryPlugStateEvent(Event):
     Attributes:
         state (:obj:'BatteryPlugState'): State of battery energy level
     """
+
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.BATTERY_PLUG_STATE, timestamp=timestamp)
         self.state = state
@@ -374,6 +424,9 @@ class BatteryLevelEvent(Event):
     Attributes:
         level (int): Battery level value
     """
+
+    __slots__ = ('level',)
+
     def __init__(self, timestamp, level):
         Event.__init__(self, event_type=EventType.BATTERY_LEVEL, timestamp=timestamp)
         self.level = level
@@ -392,6 +445,9 @@ class BatteryTempEvent(Event):
     Attributes:
         temperature (int): Battery temperature value
     """
+
+    __slots__ = ('temperature',)
+
     def __init__(self, timestamp, temperature):
         Event.__init__(self, event_type=EventType.BATTERY_TEMPERATURE, timestamp=timestamp)
         self.temperature = temperature
@@ -410,6 +466,9 @@ class DeviceStorageEvent(Event):
     Attributes:
         state (:obj:'StorageState'): State of device storage
     """
+
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.DEVICE_STORAGE, timestamp=timestamp)
         self.state = state
@@ -428,6 +487,9 @@ class HeadsetEvent(Event):
     Attributes:
         state (:obj:'HeadsetState'): New state of headset
     """
+
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.HEADSET, timestamp=timestamp)
         self.state = state
@@ -446,6 +508,9 @@ class DockEvent(Event):
     Attributes:
         state (:obj:'DockState'): Docking state of device
     """
+
+    __slots__ = ('state',)
+
     def __init__(self, timestamp, state):
         Event.__init__(self, event_type=EventType.DOCK, timestamp=timestamp)
         self.state = state
@@ -476,21 +541,29 @@ class BluetoothEvent(Event):
         DISCONNECTED = 0
         CONNECTED = 1
 
+    __slots__ = ('connection_event',)
+
     def __init__(self, timestamp, connection_event):
         Event.__init__(self, event_type=EventType.BLUETOOTH, timestamp=timestamp)
         self.connection_event = connection_event
 
 
 class SystemMemorySnapshot(Event):
+    __slots__ = ()
+
     def __init__(self, timestamp):
         Event.__init__(self, event_type=EventType.SYSTEM_MEMORY_SNAPSHOT, timestamp=timestamp)
 
 
 class TraceStart(Event):
+    __slots__ = ()
+
     def __init__(self, timestamp):
         Event.__init__(self, event_type=EventType.TRACE_START, timestamp=timestamp)
 
 class TraceEnd(Event):
+    __slots__ = ()
+
     def __init__(self, timestamp):
         Event.__init__(self, event_type=EventType.TRACE_END, timestamp=timestamp)
 
@@ -502,6 +575,9 @@ class SimDebug(Event):
     that a debug should occur
     
     """
+
+    __slots__ = ()
+
     def __init__(self, timestamp):
         Event.__init__(self, event_type=EventType.SIM_DEBUG,
                        timestamp=timestamp)
@@ -523,6 +599,9 @@ class SimAlarm(Event):
         name ('str'): A name to give the alarm (used for debug purposes)
             Defaults to empty string
     """
+
+    __slots__ = ('handler', 'interval', 'active', 'name')
+
     def __init__(self, timestamp, handler, interval=None, name=""):
         Event.__init__(self, event_type=EventType.SIM_ALARM,
                        timestamp=timestamp)
@@ -76,6 +76,8 @@ class TraceReader(metaclass=ABCMeta):
 
 
 class SimulatorBase(metaclass=ABCMeta):
+    __slots__ = ()
+
     @abstractmethod
     def build(self, config):
         pass
@@ -6,6 +6,10 @@ import json
 import pickle
 import gzip
 
+# Trace files are large but made up of many small records, so
+# read them through a large buffer to cut down on read syscalls
+TRACE_READ_BUFFER_SIZE = 1 << 20
+
 
 class JsonTraceReader(TraceReader):
     def __init__(self, filename):
@@ -17,10 +21,13 @@ class JsonTraceReader(TraceReader):
 
     def build(self):
         if self.trace_filename.endswith('.json'):
-            with open(self.trace_filename, 'r') as fp:
+            with open(self.trace_filename, 'r',
+                      buffering=TRACE_READ_BUFFER_SIZE) as fp:
                 trace_data = json.load(fp, object_hook=events.json_decode_event)
         elif self.trace_filename.endswith('.json.gz'):
-            with gzip.open(self.trace_filename, 'rt') as fp:
+            with open(self.trace_filename, 'rb',
+                      buffering=TRACE_READ_BUFFER_SIZE) as raw_fp, \
+                    gzip.open(raw_fp, 'rt') as fp:
                 trace_data = json.load(fp, object_hook=events.json_decode_event)
         else:
             raise Exception('Invalid JSON file type. Expected .json or .json.gz')
@@ -54,13 +61,8 @@ class JsonTraceReader(TraceReader):
         return self.trace_pos >= len(self.trace_logs)
 
     def get_events(self, count):
-        events_list = []
-        for i in range(count):
-            event = self.get_event()
-            if event:
-                events_list.append(event)
-            else:
-                break
+        events_list = self.trace_logs[self.trace_pos:self.trace_pos + count]
+        self.trace_pos += len(events_list)
         return events_list
 
     def get_start_time(self):
@@ -80,10 +82,13 @@ class PickleTraceReader(TraceReader):
 
     def build(self):
         if self.trace_filename.endswith('.pkl'):
-            with open(self.trace_filename, 'r') as fp:
+            with open(self.trace_filename, 'rb',
+                      buffering=TRACE_READ_BUFFER_SIZE) as fp:
                 trace_data = pickle.load(fp)
         elif self.trace_filename.endswith('.pkl.gz'):
-            with gzip.open(self.trace_filename, 'rb') as fp:
+            with open(self.trace_filename, 'rb',
+                      buffering=TRACE_READ_BUFFER_SIZE) as raw_fp, \
+                    gzip.open(raw_fp, 'rb') as fp:
                 trace_data = pickle.load(fp)
         else:
             raise Exception('Invalid JSON file type. Expected .json or .json.gz')
@@ -117,13 +122,8 @@ class PickleTraceReader(TraceReader):
         return self.trace_pos >= len(self.trace_logs)
 
     def get_events(self, count):
-        events_list = []
-        for i in range(count):
-            event = self.get_event()
-            if event:
-                events_list.append(event)
-            else:
-                break
+        events_list = self.trace_logs[self.trace_pos:self.trace_pos + count]
+        self.trace_pos += len(events_list)
         return events_list
 
     def get_start_time(self):
@@ -1,7 +1,6 @@
 #! /usr/bin/env python
 import argparse
 import configparser
-from collections import defaultdict, deque
 
 import sys
 import datetime
@@ -23,12 +22,25 @@ class Priority:
     DEBUG_LAST = 1024
 
 
+class _OutputModeChanged(Exception):
+    """ Signals that a debug stop changed the verbose setting
+
+    Raised out of a specialized run loop so that the loop
+    matching the new setting can take over.
+    """
+    pass
+
+
 class Simulator(SimulatorBase):
-    EVENT_QUEUE_THRESHOLD = 100
+    __slots__ = ('_sim_modules', '_module_type_map', '_device_state',
+                 '_event_queue', '_current_time', '_warmup_period',
+                 '_event_listeners', '_dispatch', '_trace_reader',
+                 '_trace_executed', '_verbose', '_debug_mode',
+                 '_debug_interval', '_debug_countdown', '_debug_commands')
 
     def __init__(self):
         self._sim_modules = {}
-        self._module_type_map = defaultdict(deque)
+        self._module_type_map = {}
 
         self._device_state = DeviceState()
         self._event_queue = PriorityQueue()
@@ -36,13 +48,21 @@ class Simulator(SimulatorBase):
         self._current_time = None
         self._warmup_period = None
 
-        self._event_listeners = defaultdict(deque)
+        self._event_listeners = {}
+        self._dispatch = None
         self._trace_reader = None
         self._trace_executed = False
         self._verbose = False
         self._debug_mode = False
         self._debug_interval = 1
-        self._debug_interval_cnt = 0
+        self._debug_countdown = 1
+        self._debug_commands = {
+            'quit': self.__debug_quit,
+            'exit': self.__debug_quit,
+            'q': self.__debug_quit,
+            'interval': self.__debug_interval,
+            'verbose': self.__debug_verbose,
+        }
 
     def has_module_instance(self, name):
         return name in self._sim_modules
@@ -51,8 +71,9 @@ class Simulator(SimulatorBase):
         return self._sim_modules[name]
 
     def get_module_for_type(self, module_type):
-        if module_type in self._module_type_map:
-            return self._module_type_map[module_type.value][0]
+        modules = self._module_type_map.get(module_type.value)
+        if modules:
+            return modules[0]
         else:
             return None
 
@@ -65,10 +86,11 @@ class Simulator(SimulatorBase):
 
         self._sim_modules[sim_module.get_name()] = sim_module
 
+        modules = self._module_type_map.setdefault(sim_module.get_type().value, [])
         if override:
-            self._module_type_map[sim_module.get_type().value].appendleft(sim_module)
+            modules.insert(0, sim_module)
         else:
-            self._module_type_map[sim_module.get_type().value].append(sim_module)
+            modules.append(sim_module)
 
     def build(self, args):
         self._verbose = args.verbose
@@ -115,8 +137,8 @@ class Simulator(SimulatorBase):
     def run(self):
         # Check if we need to enter debug mode immediately
         if self._debug_mode:
-            self._debug_interval_cnt = 0
             self.__debug()
+            self._debug_countdown = self._debug_interval
 
         # Add alarm event for the warmup period
         warmup_finish_alarm = SimAlarm(
@@ -126,48 +148,27 @@ class Simulator(SimulatorBase):
         self._event_queue.push(warmup_finish_alarm,
                                (warmup_finish_alarm.timestamp, Priority.SIMULATOR))
 
-        while not self._trace_reader.end_of_trace() \
-                or not self._event_queue.empty():
-
-            # Populate event queue if it is below the threshold number of events
-            if self._event_queue.size() < Simulator.EVENT_QUEUE_THRESHOLD \
-                    and not self._trace_reader.end_of_trace():
-                self.__populate_event_queue_from_trace()
-                continue
-
-            # Look at next event to execute
-            cur_event = self._event_queue.peek()
-
-            # Look at next event from trace file
-            trace_event = self._trace_reader.peek_event()
-
-            # If trace event is supposed to occur before current
-            # event, than we should populate event queue with more
-            # events from the trace file
-            if trace_event and cur_event.timestamp > trace_event.timestamp:
-                self.__populate_event_queue_from_trace()
-                continue
-
-            self._event_queue.pop()
-
-            # Set current time of simulator
-            self._current_time = cur_event.timestamp
-            if self._verbose:
-                print(cur_event)
-
-            if self._debug_mode:
-                self._debug_interval_cnt += 1
-                if self._debug_interval_cnt == self._debug_interval:
-                    self.__debug()
-                    self._debug_interval_cnt = 0
-
-            self.__execute_event(cur_event)
+        # Listeners are fixed for the rest of the simulation
+        for event_type, listeners in self._event_listeners.items():
+            self._event_listeners[event_type] = tuple(listeners)
+        self._dispatch = self.__build_dispatch()
+        self.__process_events()
         self.__finish()
 
     def subscribe(self, event_type, handler, event_filter=None):
-        if event_type not in self._event_listeners:
-            self._event_listeners[event_type] = []
-        self._event_listeners[event_type].append((event_filter, handler))
+        if self._dispatch is not None:
+            raise Exception("Cannot subscribe to events while simulation is running")
+
+        # Fold the filter into the listener at subscription time
+        # so broadcast only has to call each listener
+        if event_filter:
+            def listener(event, event_filter=event_filter, handler=handler):
+                if event_filter(event):
+                    handler(event)
+        else:
+            listener = handler
+
+        self._event_listeners.setdefault(event_type, []).append(listener)
 
     def broadcast(self, event):
         if event.timestamp:
@@ -177,11 +178,13 @@ class Simulator(SimulatorBase):
             event.timestamp = self._current_time
 
         # Get the set of listeners for the given event type
-        listeners = self._event_listeners[event.event_type]
-        for (event_filter, handler) in listeners:
-            # Send event to each subscribed listener
-            if not event_filter or event_filter(event):
-                handler(event)
+        listeners = self._event_listeners.get(event.event_type)
+        if listeners is None:
+            return
+
+        # Send event to each subscribed listener
+        for listener in listeners:
+            listener(event)
 
     def register_alarm(self, alarm):
         self._event_queue.push(alarm, (alarm.timestamp, Priority.ALARM))
@@ -210,27 +213,183 @@ class Simulator(SimulatorBase):
             sim_module.disable_stats_collection()
 
     """
-        Private method that handles execution of
-        an event object.
+        Private method that runs the main simulation loop. Each
+        combination of the verbose and debug settings has its own
+        specialized loop so that disabled checks cost nothing per
+        event. If a debug stop changes the verbose setting, the
+        running loop returns early and the matching loop resumes
+        from the same event stream.
     """
-    def __execute_event(self, event):
-        if event.event_type == EventType.SIM_DEBUG:
-            self.__debug()
-        elif event.event_type == EventType.SIM_ALARM:
-            if not self._trace_executed:
-                event.fire()
-                if event.is_repeating():
-                    self._event_queue.push(event, (event.timestamp, Priority.ALARM))
-        elif event.event_type == EventType.TRACE_END:
-            self._trace_executed = True
-        else:
-            self.broadcast(event)
+    def __process_events(self):
+        events = self.__merged_events()
+        finished = False
+        while not finished:
+            if self._debug_mode:
+                if self._verbose:
+                    run_loop = self.__run_verbose_debug
+                else:
+                    run_loop = self.__run_debug
+            elif self._verbose:
+                run_loop = self.__run_verbose
+            else:
+                run_loop = self.__run_plain
+            finished = run_loop(events)
+
+    """
+        Private generator that merges the time ordered trace with
+        the event queue and yields events in execution order until
+        both are exhausted. Trace events are yielded directly from
+        the trace reader and never enter the event queue.
+    """
+    def __merged_events(self):
+        get_trace_event = self._trace_reader.get_event
+        queue_empty = self._event_queue.empty
+        queue_peek_priority = self._event_queue.peek_priority
+        queue_pop = self._event_queue.pop
+        trace_priority = Priority.TRACE
+
+        # Next event from the trace, only refreshed once consumed
+        trace_next = get_trace_event()
+
+        while trace_next is not None:
+            # Yield the queued event if it is ordered before the next
+            # trace event. Timestamps are compared first and priorities
+            # only on a tie, so no key tuple is built per trace event.
+            if not queue_empty():
+                queue_time, queue_priority = queue_peek_priority()
+                trace_time = trace_next.timestamp
+                if queue_time < trace_time or \
+                        (queue_time == trace_time and queue_priority <= trace_priority):
+                    yield queue_pop()
+                    continue
+
+            cur_event = trace_next
+            trace_next = get_trace_event()
+            yield cur_event
+
+        # Trace is exhausted, so only queued events remain
+        while not queue_empty():
+            yield queue_pop()
+
+    def __run_plain(self, events):
+        execute = self._dispatch
+        try:
+            for cur_event in events:
+                self._current_time = cur_event.timestamp
+                execute(cur_event)
+        except _OutputModeChanged:
+            return False
+        return True
+
+    def __run_verbose(self, events):
+        execute = self._dispatch
+        try:
+            for cur_event in events:
+                self._current_time = cur_event.timestamp
+                print(cur_event)
+                execute(cur_event)
+        except _OutputModeChanged:
+            return False
+        return True
+
+    def __run_debug(self, events):
+        execute = self._dispatch
+        countdown = self._debug_countdown
+        try:
+            for cur_event in events:
+                self._current_time = cur_event.timestamp
+                countdown -= 1
+                if not countdown:
+                    self.__debug()
+                    countdown = self._debug_interval
+                    if self._verbose:
+                        execute(cur_event)
+                        return False
+                execute(cur_event)
+        except _OutputModeChanged:
+            return False
+        finally:
+            self._debug_countdown = countdown
+        return True
+
+    def __run_verbose_debug(self, events):
+        execute = self._dispatch
+        countdown = self._debug_countdown
+        try:
+            for cur_event in events:
+                self._current_time = cur_event.timestamp
+                print(cur_event)
+                countdown -= 1
+                if not countdown:
+                    self.__debug()
+                    countdown = self._debug_interval
+                    if not self._verbose:
+                        execute(cur_event)
+                        return False
+                execute(cur_event)
+        except _OutputModeChanged:
+            return False
+        finally:
+            self._debug_countdown = countdown
+        return True
+
+    """
+        Private method that generates the function used to
+        execute each event in the run loop. Event types and their
+        listeners are fixed once the simulation starts, so the
+        generated function tests the event type directly and calls
+        every listener for it by name, without going through the
+        listener dict.
+    """
+    def __build_dispatch(self):
+        namespace = {
+            'SIM_DEBUG': EventType.SIM_DEBUG,
+            'SIM_ALARM': EventType.SIM_ALARM,
+            'TRACE_END': EventType.TRACE_END,
+            'execute_debug': self.__execute_debug,
+            'execute_alarm': self.__execute_alarm,
+            'execute_trace_end': self.__execute_trace_end,
+        }
+        lines = ['def dispatch(event):',
+                 '    event_type = event.event_type']
+        branch = 'if'
+        for i, (event_type, listeners) in enumerate(self._event_listeners.items()):
+            # Simulator events are never broadcast to listeners
+            if event_type in (EventType.SIM_DEBUG, EventType.SIM_ALARM,
+                              EventType.TRACE_END):
+                continue
 
-    def __populate_event_queue_from_trace(self):
-        # Fill in event queue from trace
-        events = self._trace_reader.get_events(count=Simulator.EVENT_QUEUE_THRESHOLD)
-        for x in events:
-            self._event_queue.push(x, (x.timestamp, Priority.TRACE))
+            namespace['event_type_%d' % i] = event_type
+            lines.append('    %s event_type is event_type_%d:' % (branch, i))
+            for j, listener in enumerate(listeners):
+                namespace['listener_%d_%d' % (i, j)] = listener
+                lines.append('        listener_%d_%d(event)' % (i, j))
+            branch = 'elif'
+
+        lines += ['    %s event_type is SIM_ALARM:' % branch,
+                  '        execute_alarm(event)',
+                  '    elif event_type is SIM_DEBUG:',
+                  '        execute_debug()',
+                  '    elif event_type is TRACE_END:',
+                  '        execute_trace_end()']
+
+        exec('\n'.join(lines), namespace)
+        return namespace['dispatch']
+
+    def __execute_debug(self):
+        verbose = self._verbose
+        self.__debug()
+        if self._verbose != verbose:
+            raise _OutputModeChanged()
+
+    def __execute_alarm(self, alarm):
+        if not self._trace_executed:
+            alarm.fire()
+            if alarm.is_repeating():
+                self._event_queue.push(alarm, (alarm.timestamp, Priority.ALARM))
+
+    def __execute_trace_end(self):
+        self._trace_executed = True
 
     def __finish(self):
         output_file = sys.stdout
@@ -248,39 +407,41 @@ class Simulator(SimulatorBase):
 
     def __debug(self):
         while True:
-            command = input("(uamp-sim debug) $ ")
-            if command:
-                tokens = command.split(sep=' ')
-                cmd = tokens[0]
-                args = tokens[1:]
-                if cmd == 'quit' or cmd == 'exit' or cmd == 'q':
-                    # TODO(dmanatunga): Handle simulation quitting better
-                    print("Terminating Simulation")
-                    exit(1)
-                elif cmd == 'interval':
-                    if len(args) == 1:
-                        try:
-                            self._debug_interval = int(args[0])
-                        except ValueError:
-                            print("Command Usage Error: interval command expects one numerical value")
-                    else:
-                        print("Command Usage Error: interval command expects one numerical value")
-                elif cmd == 'verbose':
-                    if len(args) == 0:
-                        self._verbose = True
-                    elif len(args) == 1:
-                        if args[0] == 'on':
-                            self._verbose = True
-                        elif args[0] == 'off':
-                            self._verbose = False
-                        else:
-                            print("Command Usage Error: verbose command expects 'on' or 'off' for argument")
-
-                    else:
-                        print("Command Usage Error: verbose command expects at most one argument")
-            else:
+            tokens = input("(uamp-sim debug) $ ").split()
+            if not tokens:
                 break
 
+            handler = self._debug_commands.get(tokens[0])
+            if handler:
+                handler(tokens[1:])
+
+    def __debug_quit(self, args):
+        # TODO(dmanatunga): Handle simulation quitting better
+        print("Terminating Simulation")
+        exit(1)
+
+    def __debug_interval(self, args):
+        if len(args) == 1:
+            try:
+                self._debug_interval = int(args[0])
+            except ValueError:
+                print("Command Usage Error: interval command expects one numerical value")
+        else:
+            print("Command Usage Error: interval command expects one numerical value")
+
+    def __debug_verbose(self, args):
+        if len(args) == 0:
+            self._verbose = True
+        elif len(args) == 1:
+            if args[0] == 'on':
+                self._verbose = True
+            elif args[0] == 'off':
+                self._verbose = False
+            else:
+                print("Command Usage Error: verbose command expects 'on' or 'off' for argument")
+        else:
+            print("Command Usage Error: verbose command expects at most one argument")
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Run uamp_sim')
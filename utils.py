@@ -3,23 +3,32 @@ import itertools
 
 
 class PriorityQueue:
+    """ Binary heap backed priority queue
+
+    Items are stored in a flat list managed by heapq as
+    (priority, count, item) entries. The insertion count
+    breaks ties between equal priorities so that items are
+    never compared directly, and equal priority items are
+    popped in insertion order.
+    """
     def __init__(self):
-        self._queue = []
+        self._heap = []
         self._insert_ctr = itertools.count()
 
     def push(self, item, priority):
-        count = next(self._insert_ctr)
-        entry = (priority, count, item)
-        heapq.heappush(self._queue, entry)
+        heapq.heappush(self._heap, (priority, next(self._insert_ctr), item))
 
     def pop(self):
-        return heapq.heappop(self._queue)[2]
+        return heapq.heappop(self._heap)[2]
 
     def peek(self):
-        return self._queue[0][2]
+        return self._heap[0][2]
+
+    def peek_priority(self):
+        return self._heap[0][0]
 
     def size(self):
-        return len(self._queue)
+        return len(self._heap)
 
     def empty(self):
-        return len(self._queue) == 0
+        return not self._heap